@@ -5,6 +5,7 @@
 # Requirements:
 #   - Python 3.8+
 #   - pip install requests python-dotenv  (dotenv optional if you prefer .env)
+#   - pip install orjson  (optional, faster JSON encoding)
 #
 # CSV Columns (header row required):
 #   name,url,interval,response_codes,sni_host,ignore_cert_errors,follow_redirects,response_timeout_ms,on_failure_count,aws_regions,request_headers,description,labels
@@ -33,14 +34,21 @@
 
 import argparse
 import csv
+import functools
 import json
 import os
+import re
+import socket
+import ssl
 import sys
 import urllib.parse
-from typing import Dict, List, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError as e:
     print("Missing dependency: requests. Install with `pip install requests`.", file=sys.stderr)
     raise
@@ -51,6 +59,11 @@ try:
 except Exception:
     pass  # dotenv is optional
 
+try:
+    import orjson  # optional, faster JSON encoding
+except ImportError:
+    orjson = None
+
 
 INTERVAL_FIELD_MAP = {
     "1m": "interval_1_min",
@@ -58,12 +71,50 @@ INTERVAL_FIELD_MAP = {
     "15m": "interval_15_mins",
     "30m": "interval_30_mins",
 }
+_INTERVAL_ALLOWED = ", ".join(INTERVAL_FIELD_MAP)
+
+# [scheme:]//[userinfo@]host[:port]... -> host (IPv6 literals keep their
+# brackets). Together with dropping tab/CR/LF, as urlparse does, this matches
+# urlparse(url).hostname for stripped URLs without building a full parse
+# result per row.
+_HOST_RE = re.compile(r"(?:[a-zA-Z][a-zA-Z0-9+.\-]*:)?//(?:[^/?#]*@)?(\[[^\]/?#]*\]|[^/:?#]*)")
+_URL_UNSAFE = str.maketrans("", "", "\t\r\n")
+
+MAX_ERROR_BODY = 16 * 1024  # bytes of an error response shown in FAILED output
+
+_TRUTHY = frozenset({"1", "true", "yes", "y", "on"})
+
+# Constant parts of every payload. They are shared by all rows and only ever
+# serialized, so they must never be mutated.
+_EMPTY = {}
+_HEALTH_POLICY = {
+    "dynamic_threshold_disabled": _EMPTY,
+    "static_max_threshold_disabled": _EMPTY,
+    "static_min_threshold_disabled": _EMPTY
+}
+
+
+def json_dumps(obj: object, pretty: bool=False) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles them
+    if pretty:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def json_loads(data: bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def parse_bool(value: str, default: bool) -> bool:
     if value is None or value == "":
         return default
-    return str(value).strip().lower() in {"1", "true", "yes", "y", "on"}
+    return str(value).strip().lower() in _TRUTHY
 
 
 def parse_int(value: str, default: int) -> int:
@@ -75,6 +126,11 @@ def parse_int(value: str, default: int) -> int:
         return default
 
 
+# parse_headers, parse_labels, parse_aws_sources and generate_monitor_name are
+# pure functions of one string, and CSVs usually repeat the same headers, labels
+# and regions on every row, so their results are cached. Cached lists/dicts are
+# shared between payloads and must not be mutated.
+@functools.lru_cache(maxsize=4096)
 def parse_headers(s: str) -> List[Dict[str, str]]:
     if not s:
         return []
@@ -90,6 +146,7 @@ def parse_headers(s: str) -> List[Dict[str, str]]:
     return items
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_labels(s: str) -> Dict[str, str]:
     labels = {}
     if not s:
@@ -105,24 +162,42 @@ def parse_labels(s: str) -> Dict[str, str]:
     return labels
 
 
+@functools.lru_cache(maxsize=4096)
+def parse_aws_sources(s: str) -> List[Dict]:
+    """Build the external_sources list for comma-separated AWS regions ([] if none)."""
+    regions = [r.strip() for r in s.split(",") if r.strip()]
+    if not regions:
+        return []
+    return [{"aws": {"regions": regions}}]
+
+
+@functools.lru_cache(maxsize=4096)
 def generate_monitor_name(url: str) -> str:
     """Generate monitor name from the FQDN in the URL."""
-    parsed = urllib.parse.urlparse(url)
-    fqdn = parsed.hostname or "unknown"
-    return fqdn.replace(".", "-").lower() + "-monitor"
+    m = _HOST_RE.match(url.translate(_URL_UNSAFE))
+    fqdn = m.group(1).strip("[]") if m else ""
+    return (fqdn or "unknown").replace(".", "-").lower() + "-monitor"
+
+
+def positive_int(value: str) -> int:
+    n = parse_int(value, 0)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got '{value}'")
+    return n
 
 
 def build_payload(row: Dict[str, str]) -> Tuple[Dict, List[str]]:
     errors = []
     url = row.get("url", "").strip()
     interval = row.get("interval", "").strip().lower()
-    aws_regions = [r.strip() for r in (row.get("aws_regions", "")).split(",") if r.strip()]
+    external_sources = parse_aws_sources(row.get("aws_regions") or "")
 
     if not url:
         errors.append("Missing required field: url")
-    if interval not in INTERVAL_FIELD_MAP:
-        errors.append(f"Invalid interval '{interval}'. Allowed: {', '.join(INTERVAL_FIELD_MAP.keys())}")
-    if not aws_regions:
+    interval_field = INTERVAL_FIELD_MAP.get(interval)
+    if interval_field is None:
+        errors.append(f"Invalid interval '{interval}'. Allowed: {_INTERVAL_ALLOWED}")
+    if not external_sources:
         errors.append("Missing required field: aws_regions (comma-separated)")
 
     if errors:
@@ -135,34 +210,25 @@ def build_payload(row: Dict[str, str]) -> Tuple[Dict, List[str]]:
 
     spec = {
         "url": url,
-        INTERVAL_FIELD_MAP[interval]: {},
-        "get": {},
+        interval_field: _EMPTY,
+        "get": _EMPTY,
         "request_headers": headers,
         "on_failure_count": parse_int(row.get("on_failure_count"), 2),
         "ignore_cert_errors": parse_bool(row.get("ignore_cert_errors"), False),
         "follow_redirects": parse_bool(row.get("follow_redirects"), True),
         "response_timeout": parse_int(row.get("response_timeout_ms"), 10000),
-        "external_sources": [
-            {
-                "aws": {
-                    "regions": aws_regions
-                }
-            }
-        ],
+        "external_sources": external_sources,
         "source_critical_threshold": 2,
-        "sni_host": (row.get("sni_host") or "").strip() or None,
-        "response_codes": response_codes,
-        "health_policy": {
-            "dynamic_threshold_disabled": {},
-            "static_max_threshold_disabled": {},
-            "static_min_threshold_disabled": {}
-        }
     }
-    spec = {k: v for k, v in spec.items() if v is not None}
+    sni_host = (row.get("sni_host") or "").strip()
+    if sni_host:
+        spec["sni_host"] = sni_host
+    spec["response_codes"] = response_codes
+    spec["health_policy"] = _HEALTH_POLICY
 
     payload = {
         "metadata": {
-            "annotations": {},
+            "annotations": _EMPTY,
             "description": (row.get("description") or f"http monitor for {url}")[:512],
             "disable": False,
             "labels": labels,
@@ -173,21 +239,228 @@ def build_payload(row: Dict[str, str]) -> Tuple[Dict, List[str]]:
     return payload, []
 
 
-def create_monitor(session: requests.Session, base_url: str, namespace: str, payload: Dict, dry_run: bool=False) -> Tuple[bool, str]:
-    path = f"/api/observability/synthetic_monitor/namespaces/{namespace}/v1_http_monitors"
-    url = base_url.rstrip("/") + path
+def read_rows(f: TextIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Yield (1-based row number, row) pairs from the start of an open CSV file."""
+    f.seek(0)
+    return enumerate(csv.DictReader(f), start=1)
+
+
+def validate_rows(f: TextIO) -> Tuple[int, Set[int], Set[int]]:
+    """Run build_payload over every CSV row, printing errors.
+
+    Returns the row count, the (1-based) numbers of the rows that failed
+    validation, and those whose generated monitor name repeats an earlier row
+    (the API would reject them with 409).
+    """
+    total, invalid, duplicates = 0, set(), set()
+    seen = {}
+    for i, row in read_rows(f):
+        total = i
+        payload, errors = build_payload(row)
+        if errors:
+            print(f"[Row {i}] Validation errors for url='{row.get('url','?')}': " + "; ".join(errors), file=sys.stderr)
+            invalid.add(i)
+            continue
+        name = payload["metadata"]["name"]
+        if name in seen:
+            print(f"[Row {i}] Duplicate monitor name '{name}' (first at row {seen[name]}); skipping", file=sys.stderr)
+            duplicates.add(i)
+            continue
+        seen[name] = i
+    return total, invalid, duplicates
+
+
+def create_monitor(session: requests.Session, endpoint_url: str, payload: Dict, dry_run: bool=False) -> Tuple[bool, str]:
     if dry_run:
-        return True, f"[DRY-RUN] Would POST to {url} with payload:\n{json.dumps(payload, indent=2)}"
-    resp = session.post(url, json=payload, timeout=30)
-    if resp.status_code in (200, 201, 202):
-        return True, f"Created: {payload['metadata']['name']} (HTTP {resp.status_code})"
+        return True, f"[DRY-RUN] Would POST to {endpoint_url} with payload:\n{json_dumps(payload, pretty=True).decode()}"
+    # Pre-encoded body; the session already sends Content-Type: application/json.
+    # The response is streamed: on success only the status code is needed, and
+    # error bodies are read up to MAX_ERROR_BODY bytes.
+    resp = session.post(endpoint_url, data=json_dumps(payload), timeout=30, stream=True)
+    try:
+        if resp.status_code in (200, 201, 202):
+            return True, f"Created: {payload['metadata']['name']} (HTTP {resp.status_code})"
+        # iter_content wraps urllib3 read errors (truncated body, read timeout)
+        # in RequestException, which report_result counts as a failed row. A
+        # chunked response may arrive in many small pieces, so keep reading
+        # until the cap or EOF.
+        chunks, size = [], 0
+        for chunk in resp.iter_content(MAX_ERROR_BODY):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_ERROR_BODY:
+                break
+        body = b"".join(chunks)[:MAX_ERROR_BODY]
+    finally:
+        # Discard anything left unread so the connection goes back to the pool.
+        resp.raw.drain_conn()
+        resp.raw.release_conn()
+    try:
+        detail_str = json_dumps(json_loads(body), pretty=True).decode()
+    except ValueError:
+        detail_str = body.decode("utf-8", "replace")
+    return False, f"FAILED: {payload['metadata']['name']} (HTTP {resp.status_code})\n{detail_str}"
+
+
+def load_state(path: str) -> Set[str]:
+    """Return the names recorded as successfully created in a --state-file."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                entry = json_loads(line)
+            except ValueError:
+                continue  # e.g. a partial last line from an interrupted run
+            if isinstance(entry, dict) and entry.get("ok") and "name" in entry:
+                done.add(entry["name"])
+    return done
+
+
+class StateWriter:
+    """Append-only JSONL log of create results, used to resume interrupted runs.
+
+    Lines are flushed as they are written and fsync'd every `sync_every`
+    records (and on close) to balance durability against per-row syscalls.
+    Results are reported from the main thread only, so no locking is needed.
+    """
+
+    def __init__(self, path: str, sync_every: int=50):
+        self._f = open(path, "a+b")
+        # Terminate a partial last line left by an interrupted run.
+        if self._f.seek(0, os.SEEK_END) > 0:
+            self._f.seek(-1, os.SEEK_END)
+            if self._f.read(1) != b"\n":
+                self._f.write(b"\n")
+        self._sync_every = sync_every
+        self._unsynced = 0
+
+    def record(self, name: str, ok: bool):
+        self._f.write(json_dumps({"name": name, "ok": ok}) + b"\n")
+        self._f.flush()
+        self._unsynced += 1
+        if self._unsynced >= self._sync_every:
+            os.fsync(self._f.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+
+
+def report_result(fut: Future, name: str, state: Optional[StateWriter]=None) -> bool:
+    """Wait for a create_monitor future, print its outcome and return whether it succeeded."""
+    try:
+        ok, msg = fut.result()
+    except requests.RequestException as e:
+        ok, msg = False, f"FAILED: {name} ({e})"
+    print(msg)
+    if state is not None:
+        state.record(name, ok)
+    return ok
+
+
+def requests_ca_bundle() -> str:
+    """The CA bundle requests itself verifies against: REQUESTS_CA_BUNDLE/CURL_CA_BUNDLE, else certifi."""
+    return os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or requests.certs.where()
+
+
+def build_ssl_context(ca_bundle: Optional[str]) -> ssl.SSLContext:
+    """Build the shared client context; `ca_bundle` is a CA file or directory, or None to skip verification."""
+    if ca_bundle is None:
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    elif os.path.isdir(ca_bundle):
+        ctx = ssl.create_default_context(capath=ca_bundle)
     else:
-        try:
-            details = resp.json()
-            detail_str = json.dumps(details, indent=2)
-        except Exception:
-            detail_str = resp.text
-        return False, f"FAILED: {payload['metadata']['name']} (HTTP {resp.status_code})\n{detail_str}"
+        ctx = ssl.create_default_context(cafile=ca_bundle)
+    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+    ctx.options &= ~ssl.OP_NO_TICKET
+    return ctx
+
+
+class TLSAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections all share one SSLContext.
+
+    The context already holds the CA bundle, so the ca_certs/ca_cert_dir that
+    requests sets on every pool and connection are dropped; otherwise urllib3
+    would reload the bundle into the context on each new connection.
+
+    If `pinned` is a (hostname, ip) pair, requests to that hostname connect to
+    the pre-resolved IP while the Host header and TLS SNI/certificate checks
+    still use the hostname, so growing the pool never hits the resolver.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext, pinned: Optional[Tuple[str, str]]=None, **kwargs):
+        self.ssl_context = ssl_context
+        self.pinned = pinned
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        if self.pinned:
+            kwargs["server_hostname"] = self.pinned[0]
+        return super().init_poolmanager(*args, **kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        pool_kwargs.pop("ca_certs", None)
+        pool_kwargs.pop("ca_cert_dir", None)
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+
+    def send(self, request, **kwargs):
+        if self.pinned:
+            host, ip = self.pinned
+            parts = urllib.parse.urlsplit(request.url)
+            if parts.hostname == host:
+                netloc = ip if parts.port is None else f"{ip}:{parts.port}"
+                request.url = parts._replace(netloc=netloc).geturl()
+                request.headers["Host"] = parts.netloc
+        return super().send(request, **kwargs)
+
+
+def resolve_host(host: str) -> Optional[Tuple[str, str]]:
+    """Resolve `host` once for TLSAdapter pinning; None (normal DNS) if the lookup fails."""
+    try:
+        return host, socket.gethostbyname(host)
+    except OSError as e:
+        print(f"Could not pre-resolve {host} ({e}); falling back to per-connection DNS lookups.", file=sys.stderr)
+        return None
+
+
+def build_session(headers: Dict[str, str], verify: bool, pool_size: int, pinned: Optional[Tuple[str, str]]=None) -> requests.Session:
+    """Create a keep-alive session whose connection pool fits `pool_size` parallel requests."""
+    session = requests.Session()
+    session.headers.update(headers)
+    session.headers["Connection"] = "keep-alive"
+    session.verify = verify
+    # Creating a monitor is not idempotent, so only retry when the server
+    # rejected the request without processing it (429/503, honouring
+    # Retry-After) and never re-send after a read timeout or a 500/502/504,
+    # where the monitor may already exist. The pool is sized to the worker
+    # count so parallel requests never fall back to a fresh TCP+TLS handshake
+    # once the default 10 connections are in use.
+    retries = Retry(
+        total=5,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=(429, 503),
+        allowed_methods=["POST"],
+        respect_retry_after_header=True,
+    )
+    ssl_context = build_ssl_context(requests_ca_bundle() if verify else None)
+    adapter = TLSAdapter(ssl_context, pinned, pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 def main():
@@ -198,7 +471,11 @@ def main():
     parser.add_argument("--api-token", default=os.getenv("F5XC_API_TOKEN"), help="XC API token, or set env F5XC_API_TOKEN")
     parser.add_argument("--base-domain", default="console.ves.volterra.io", help="XC console domain (default: console.ves.volterra.io)")
     parser.add_argument("--insecure", action="store_true", help="Disable TLS verification (not recommended)")
+    parser.add_argument("--resolve-once", action="store_true", help="Resolve the console hostname once at startup and reuse that IP for every connection")
     parser.add_argument("--dry-run", action="store_true", help="Print requests without creating monitors")
+    parser.add_argument("--state-file", help="JSONL file recording created monitors; rows already recorded there are skipped on reruns")
+    parser.add_argument("--continue-on-error", action="store_true", help="Create the valid rows even if some rows fail validation")
+    parser.add_argument("--concurrency", type=positive_int, default=16, help="Number of monitors to create in parallel (default: 16)")
     args = parser.parse_args()
 
     if not args.api_token:
@@ -206,39 +483,83 @@ def main():
         sys.exit(2)
 
     base_url = f"https://{args.tenant}.{args.base_domain}"
+    endpoint_url = f"{base_url.rstrip('/')}/api/observability/synthetic_monitor/namespaces/{args.namespace}/v1_http_monitors"
     headers = {
         "Authorization": f"APIToken {args.api_token}",
         "Content-Type": "application/json"
     }
 
     verify = not args.insecure
-    session = requests.Session()
-    session.headers.update(headers)
-    session.verify = verify
+    pinned = None
+    if args.resolve_once and not args.dry_run:
+        pinned = resolve_host(urllib.parse.urlsplit(base_url).hostname)
+    session = build_session(headers, verify, args.concurrency, pinned)
 
     with open(args.csv, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
-    if not rows:
-        print("No rows found in CSV.", file=sys.stderr)
-        sys.exit(1)
-
-    success, fail = 0, 0
-    for i, row in enumerate(rows, start=1):
-        payload, errors = build_payload(row)
-        if errors:
-            print(f"[Row {i}] Validation errors for url='{row.get('url','?')}': " + "; ".join(errors), file=sys.stderr)
-            fail += 1
-            continue
-        ok, msg = create_monitor(session, base_url, args.namespace, payload, dry_run=args.dry_run)
-        print(msg)
-        if ok:
-            success += 1
-        else:
-            fail += 1
-
-    print(f"\nDone. Success: {success}, Failed: {fail}, Total: {len(rows)}")
+        # Validate every row before any network I/O so a bad CSV fails fast.
+        total, invalid, duplicates = validate_rows(f)
+        if total == 0:
+            print("No rows found in CSV.", file=sys.stderr)
+            sys.exit(1)
+        if invalid and not args.continue_on_error:
+            print(f"\n{len(invalid)} of {total} rows failed validation; no monitors were created. "
+                  "Fix the CSV or pass --continue-on-error to create the valid rows.", file=sys.stderr)
+            sys.exit(2)
+
+        skip = invalid | duplicates
+        success, fail, already = 0, len(skip), 0
+        done = load_state(args.state_file) if args.state_file else set()
+        state = StateWriter(args.state_file) if args.state_file and not args.dry_run else None
+        # Rows are re-read lazily and handed to the pool as they are parsed. At
+        # most `max_pending` requests are outstanding so memory stays bounded;
+        # results are collected as soon as any request finishes, so one slow
+        # response never holds back submission of the rows behind it.
+        max_pending = 2 * args.concurrency
+        pending = {}
+        try:
+            with ThreadPoolExecutor(max_workers=args.concurrency) as ex:
+                try:
+                    for i, row in read_rows(f):
+                        if i in skip:
+                            continue
+                        payload, _ = build_payload(row)
+                        name = payload["metadata"]["name"]
+                        if name in done:
+                            print(f"Skipped: {name} (already created per {args.state_file})")
+                            already += 1
+                            continue
+                        fut = ex.submit(create_monitor, session, endpoint_url, payload, args.dry_run)
+                        pending[fut] = name
+                        if len(pending) >= max_pending:
+                            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for fut in finished:
+                                if report_result(fut, pending.pop(fut), state):
+                                    success += 1
+                                else:
+                                    fail += 1
+                    for fut in as_completed(pending):
+                        if report_result(fut, pending.pop(fut), state):
+                            success += 1
+                        else:
+                            fail += 1
+                except KeyboardInterrupt:
+                    # Stop requests that have not started yet; shutdown() would
+                    # otherwise still run every queued POST before exiting.
+                    for fut in pending:
+                        fut.cancel()
+                    raise
+        finally:
+            if state is not None:
+                # On Ctrl-C queued requests are cancelled above, but the executor
+                # still finishes the ones already running before we get here;
+                # record those that were never reported so a rerun does not
+                # POST them again.
+                for fut, name in pending.items():
+                    if fut.done() and not fut.cancelled() and fut.exception() is None:
+                        state.record(name, fut.result()[0])
+                state.close()
+
+    print(f"\nDone. Success: {success}, Failed: {fail}, Skipped: {already}, Total: {total}")
     if fail > 0:
         sys.exit(1)
 